@@ -1,9 +1,7 @@
 import pandas as pd
 import numpy as np
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from openpyxl.utils.dataframe import dataframe_to_rows
-from openpyxl.utils import get_column_letter
+import xlsxwriter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 import logging
@@ -12,6 +10,34 @@ import logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Excel stores dates as day serials from 1899-12-30; numbers in this range
+# (1970-01-01 .. 9999-12-31) are read as serials, anything else numeric is not a date
+EXCEL_EPOCH = '1899-12-30'
+EXCEL_SERIAL_MIN = 25569
+EXCEL_SERIAL_MAX = 2958465
+
+# Fill styles, shared by every report (formats themselves are registered per workbook)
+_GREEN_FILL = {'bg_color': '#C6EFCE'}
+_YELLOW_FILL = {'bg_color': '#FFE699'}
+_RED_FILL = {'bg_color': '#FFC7CE'}
+_HIGHLIGHT_FILL = {'bg_color': '#E2EFDA'}
+
+# Title and section styles for the hand-built sheets
+_TITLE_STYLE = {'font_size': 16, 'bold': True, 'font_color': 'white', 'bg_color': '#4472C4',
+                'align': 'center', 'valign': 'vcenter'}
+_SUBTITLE_STYLE = {'font_size': 12, 'bold': True, 'font_color': '#444444', 'align': 'center'}
+_PERIOD_STYLE = {'italic': True, 'font_color': '#666666', 'align': 'center'}
+_SHEET_TITLE_STYLE = {'font_size': 14, 'bold': True}
+_INSIGHTS_TITLE_STYLE = {**_SHEET_TITLE_STYLE, 'font_color': '#4472C4'}
+_SECTION_STYLE = {'bold': True, 'underline': 1}
+_BOLD_STYLE = {'bold': True}
+_INSIGHT_STYLE = {'bold': True, 'font_size': 11}
+
+# Table header (blue, white text) and the thin cell border
+_HEADER_STYLE = {'bold': True, 'font_color': 'white', 'bg_color': '#4472C4',
+                 'align': 'center', 'valign': 'vcenter'}
+_BORDER = {'border': 1}
+
 class DataLoader:
     def __init__(self, config=None):
         """Initialize loader"""
@@ -40,46 +66,107 @@ class DataLoader:
             if missing:
                 raise ValueError(f"Missing required fields: {missing}")
 
-            # 2. Setup Output Path
+            # 2. Normalize Columns
+            # Only the columns built here are new; assign shares the rest with the caller's
+            # frame instead of copying it, and the caller's frame is never mutated.
+            normalized = {'amount': pd.to_numeric(df['amount'], errors='coerce')}
+            
+            # Dates, vectorized over the column: Excel serials and date strings each take one
+            # pd.to_datetime pass; anything unparseable becomes NaT instead of raising.
+            # Sheets rely on df['date'] being datetime64 from here on.
+            if not pd.api.types.is_datetime64_any_dtype(df['date']):
+                dates = df['date']
+                serials = pd.to_numeric(dates, errors='coerce')
+                is_serial = serials.between(EXCEL_SERIAL_MIN, EXCEL_SERIAL_MAX)
+                # Numeric-looking strings outside the serial range (e.g. '20230105') are still text;
+                # only those rows (usually none) pay for a per-element type check
+                is_text = serials.isna()
+                out_of_range = serials.notna() & ~is_serial
+                if out_of_range.any():
+                    is_text[out_of_range] = dates[out_of_range].map(lambda v: isinstance(v, str))
+                text = dates.where(is_text)
+                from_text = pd.to_datetime(text, errors='coerce')
+                # The format is inferred from the first value; re-parse the rest per element
+                unparsed = from_text.isna() & text.notna()
+                if unparsed.any():
+                    from_text[unparsed] = pd.to_datetime(text[unparsed], errors='coerce', format='mixed')
+                    unparsed &= from_text.isna()
+                from_serial = pd.to_datetime(serials.where(is_serial), unit='D', origin=EXCEL_EPOCH)
+                normalized['date'] = from_text.mask(is_serial, from_serial)
+                
+                # Report values that did not become dates; blank strings are just missing
+                failed = unparsed | (is_serial & from_serial.isna()) | (out_of_range & ~is_text)
+                if failed.any():
+                    failed[failed] = ~dates[failed].map(lambda v: isinstance(v, str) and not v.strip())
+                    if failed.any():
+                        logger.warning(f"{int(failed.sum())} date value(s) could not be parsed and were left blank")
+            
+            # Grouping keys as categoricals so every groupby hashes integer codes, not strings
+            for col in ('vendor', 'category'):
+                if col in df.columns:
+                    normalized[col] = df[col].astype('category')
+            
+            df = df.assign(**normalized)
+
+            # 3. Setup Output Path
             if output_path is None:
                 timestamp = datetime.now().strftime("%Y-%m-%d_%H%M%S")
                 output_path = f"procurement_analysis_{timestamp}.xlsx"
             
             # Ensure output directory exists if path contains directory
-            output_dir = Path(output_path).parent
-            if output_dir.name and not output_dir.exists():
-                output_dir.mkdir(parents=True, exist_ok=True)
-
-            # 3. Create Workbook
-            wb = Workbook()
-            # Remove default sheet
-            if 'Sheet' in wb.sheetnames:
-                wb.remove(wb['Sheet'])
+            Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+
+            # 4. Shared Aggregates
+            # One vendor aggregation feeds the summary, vendor and insights sheets
+            vendor_agg = self._aggregate_vendors(df)
+            total_spend = df['amount'].sum()
+            amount_count = df['amount'].count()
+            avg_amount = total_spend / amount_count if amount_count else np.nan
+            
+            # 5. Sheet Tables
+            # Aggregations run in parallel (pandas/NumPy release the GIL in their C loops);
+            # the workbook is not thread-safe, so all writing below stays on this thread.
+            with ThreadPoolExecutor(max_workers=self.config.get('max_workers', 4)) as pool:
+                vendor_table = pool.submit(self._build_vendor_table, df, vendor_agg, total_spend)
+                category_table = pool.submit(self._build_category_table, df, total_spend)
+                monthly_table = pool.submit(self._build_monthly_table, df)
+                completeness = pool.submit(self._build_completeness, df)
+
+            # 6. Create Workbook
+            # constant_memory flushes each row to disk as soon as the next one starts,
+            # so every sheet must be written top to bottom (widths/merges set in order).
+            wb = xlsxwriter.Workbook(output_path, {
+                'constant_memory': True,
+                'strings_to_numbers': False,
+                'strings_to_urls': False,
+                'nan_inf_to_errors': True,
+                'default_date_format': 'yyyy-mm-dd h:mm:ss',
+            })
             
-            # 4. Generate Sheets
+            # 7. Generate Sheets
             logger.info("Generating 'Executive Summary'...")
-            self._create_executive_summary(wb, df)
+            self._create_executive_summary(wb, df, vendor_agg, total_spend, avg_amount)
             
             logger.info("Generating 'Spend by Vendor'...")
-            self._create_vendor_analysis(wb, df)
+            self._create_vendor_analysis(wb, vendor_table.result())
             
             logger.info("Generating 'Spend by Category'...")
-            self._create_category_analysis(wb, df)
+            self._create_category_analysis(wb, category_table.result())
             
             logger.info("Generating 'Monthly Trends'...")
-            self._create_monthly_trends(wb, df)
+            self._create_monthly_trends(wb, monthly_table.result())
             
             logger.info("Generating 'Top Insights'...")
-            self._create_insights(wb, df)
+            self._create_insights(wb, df, vendor_agg, total_spend)
             
             logger.info("Generating 'Detailed Data'...")
             self._create_detailed_data(wb, df)
             
             logger.info("Generating 'Data Quality Report'...")
-            self._create_data_quality_report(wb, df)
+            self._create_data_quality_report(wb, completeness.result())
             
-            # 5. Save
-            wb.save(output_path)
+            # 8. Save
+            wb.close()
             logger.info(f"Report saved successfully to: {output_path}")
             
             return output_path
@@ -88,44 +175,40 @@ class DataLoader:
             logger.error(f"Error generating Excel: {str(e)}")
             raise
 
-    def _create_executive_summary(self, wb, df):
+    def _aggregate_vendors(self, df):
+        """Per-vendor spend sum/count/mean via np.bincount over the categorical vendor codes"""
+        vendors = df['vendor'].cat.categories
+        codes = df['vendor'].cat.codes.to_numpy()
+        amounts = df['amount'].to_numpy(dtype=np.float64, na_value=np.nan)
+        
+        has_vendor = codes >= 0
+        has_amount = has_vendor & ~np.isnan(amounts)
+        rows = np.bincount(codes[has_vendor], minlength=len(vendors))
+        spend = np.bincount(codes[has_amount], weights=amounts[has_amount], minlength=len(vendors))
+        count = np.bincount(codes[has_amount], minlength=len(vendors))
+        
+        # Like groupby(observed=True): only vendors that actually appear in the data
+        vendor_agg = pd.DataFrame({'sum': spend, 'count': count}, index=vendors.rename('vendor'))[rows > 0]
+        # Means derived from sum/count rather than reducing the amount column again
+        vendor_agg['mean'] = vendor_agg['sum'] / vendor_agg['count']
+        return vendor_agg
+
+    def _create_executive_summary(self, wb, df, vendor_agg, total_spend, avg_tx):
         """Sheet 1: Executive Summary"""
-        ws = wb.create_sheet("Executive Summary")
-        
-        # Title
-        ws['A1'] = 'EXECUTIVE SUMMARY'
-        ws['A1'].font = Font(size=16, bold=True, color='FFFFFF')
-        ws['A1'].fill = PatternFill(start_color='4472C4', fill_type='solid')
-        ws.merge_cells('A1:C1')
-        ws['A1'].alignment = Alignment(horizontal='center', vertical='center')
-        
-        ws['A2'] = 'Procurement Analysis Report'
-        ws['A2'].font = Font(size=12, bold=True, color='444444')
-        ws.merge_cells('A2:C2')
-        ws['A2'].alignment = Alignment(horizontal='center')
-
-        # Detect Period
-        try:
-            min_date = pd.to_datetime(df['date']).min().strftime('%Y-%m-%d')
-            max_date = pd.to_datetime(df['date']).max().strftime('%Y-%m-%d')
-            ws['A3'] = f"Period: {min_date} to {max_date}"
-        except:
-            ws['A3'] = "Period: Unknown"
-        
-        ws['A3'].font = Font(italic=True, color='666666')
-        ws.merge_cells('A3:C3')
-        ws['A3'].alignment = Alignment(horizontal='center')
+        ws = wb.add_worksheet("Executive Summary")
+        
+        # Detect Period (dates are normalized in load; all-NaT means nothing parsed)
+        min_date, max_date = df['date'].min(), df['date'].max()
+        if pd.notna(min_date):
+            period = f"Period: {min_date:%Y-%m-%d} to {max_date:%Y-%m-%d}"
+        else:
+            period = "Period: Unknown"
 
         # Metrics
-        total_spend = df['amount'].sum()
         tx_count = len(df)
-        vendor_count = df['vendor'].nunique()
-        avg_tx = df['amount'].mean()
+        vendor_count = len(vendor_agg)
         cat_count = df['category'].nunique() if 'category' in df.columns else 0
         
-        ws['A5'] = 'KEY METRICS'
-        ws['A5'].font = Font(bold=True, underline='single')
-        
         metrics = [
             ('Total Spend', f"${total_spend:,.0f}"),
             ('Number of Transactions', f"{tx_count:,}"),
@@ -134,56 +217,77 @@ class DataLoader:
             ('Number of Categories', f"{cat_count:,}")
         ]
         
+        # Top 5 by spend: argpartition is O(vendors), then only those 5 are sorted
+        spend = vendor_agg['sum'].to_numpy()
+        k = min(5, len(spend))
+        top = np.argpartition(-spend, k - 1)[:k] if k < len(spend) else np.arange(k)
+        top = top[np.argsort(-spend[top], kind='stable')]
+        top_names = vendor_agg.index.to_numpy()[top]
+        top_spend = spend[top]
+        top_pct = top_spend / total_spend
+        top_count = vendor_agg['count'].to_numpy()[top]
+        
+        # Table Header
+        headers = ['Rank', 'Vendor Name', 'Total Spend', '% of Total', 'Transactions']
+        header_format = self._header_format(wb, _BORDER)
+        money_format = wb.add_format({'num_format': '$#,##0', **_BORDER})
+        pct_format = wb.add_format({'num_format': '0.0%', **_BORDER})
+        
+        # Widths must be set up front, so size them from the content rather than the cells
+        columns = [
+            ['KEY METRICS', *(label for label, _ in metrics), "TOP 5 VENDORS BY SPEND", headers[0]],
+            [val for _, val in metrics] + [headers[1], *top_names],
+            [headers[2], *(f"${v:,.0f}" for v in top_spend)],
+            [headers[3], *(f"{v:.1%}" for v in top_pct)],
+            [headers[4], *top_count],
+        ]
+        self._set_column_widths(ws, [max(len(str(v)) for v in values) for values in columns])
+        
+        # Title
+        for cell_range, text, style in (('A1:C1', 'EXECUTIVE SUMMARY', _TITLE_STYLE),
+                                        ('A2:C2', 'Procurement Analysis Report', _SUBTITLE_STYLE),
+                                        ('A3:C3', period, _PERIOD_STYLE)):
+            ws.merge_range(cell_range, text, wb.add_format({**style, **_BORDER}))
+        
+        ws.write('A5', 'KEY METRICS', wb.add_format({**_SECTION_STYLE, **_BORDER}))
+        
+        label_format = wb.add_format(_BORDER)
+        value_format = wb.add_format({'align': 'right', **_BORDER})
         row = 6
         for label, val in metrics:
-            ws[f'A{row}'] = label
-            ws[f'B{row}'] = val
-            ws[f'B{row}'].alignment = Alignment(horizontal='right')
+            ws.write(f'A{row}', label, label_format)
+            ws.write(f'B{row}', val, value_format)
             row += 1
             
         # Top 5 Vendors
         row += 2
-        ws[f'A{row}'] = "TOP 5 VENDORS BY SPEND"
-        ws[f'A{row}'].font = Font(bold=True)
+        ws.write(f'A{row}', "TOP 5 VENDORS BY SPEND", wb.add_format({**_BOLD_STYLE, **_BORDER}))
         row += 1
         
-        # Table Header
-        headers = ['Rank', 'Vendor Name', 'Total Spend', '% of Total', 'Transactions']
-        for col, h in enumerate(headers, 1):
-            cell = ws.cell(row=row, column=col, value=h)
-            self._apply_header_style(cell)
-        
-        top_vendors = df.groupby('vendor')['amount'].agg(['sum', 'count']).nlargest(5, 'sum').reset_index()
-        top_vendors['pct'] = top_vendors['sum'] / total_spend
+        ws.write_row(f'A{row}', headers, header_format)
         
         row += 1
-        for idx, r in top_vendors.iterrows():
-            ws.cell(row=row, column=1, value=idx+1)
-            ws.cell(row=row, column=2, value=r['vendor'])
-            ws.cell(row=row, column=3, value=r['sum']).number_format = '$#,##0'
-            ws.cell(row=row, column=4, value=r['pct']).number_format = '0.0%'
-            ws.cell(row=row, column=5, value=r['count'])
+        for rank, (name, vendor_spend, pct, count) in enumerate(zip(top_names, top_spend, top_pct, top_count), 1):
+            ws.write(f'A{row}', rank, label_format)
+            ws.write(f'B{row}', name, label_format)
+            ws.write(f'C{row}', vendor_spend, money_format)
+            ws.write(f'D{row}', pct, pct_format)
+            ws.write(f'E{row}', count, label_format)
             row += 1
 
-        # Formatting
-        self._apply_standard_formatting(ws)
-
-    def _create_vendor_analysis(self, wb, df):
-        """Sheet 2: Spend by Vendor"""
-        ws = wb.create_sheet("Spend by Vendor")
-        
+    def _build_vendor_table(self, df, vendor_agg, total_spend):
+        """Table for Sheet 2: vendors ranked by spend"""
         # Aggregation
-        vendor_analysis = df.groupby('vendor').agg({
-            'amount': ['sum', 'count', 'mean']
-        }).reset_index()
+        vendor_analysis = vendor_agg.reset_index()
         
         vendor_analysis.columns = ['Vendor Name', 'Total Spend', 'Transaction Count', 'Average Transaction']
-        total_spend = df['amount'].sum()
         vendor_analysis['% of Total Spend'] = vendor_analysis['Total Spend'] / total_spend
         
         # Optional fields
         if 'vendor_country' in df.columns:
-            country_map = df.groupby('vendor')['vendor_country'].first()
+            # First non-null country per vendor, without a full groupby aggregation
+            pairs = df[['vendor', 'vendor_country']].dropna().drop_duplicates('vendor')
+            country_map = pairs.set_index('vendor')['vendor_country']
             vendor_analysis['Vendor Country'] = vendor_analysis['Vendor Name'].map(country_map)
             
         # Sort
@@ -195,102 +299,103 @@ class DataLoader:
         if 'Vendor Country' in vendor_analysis.columns:
              cols.append('Vendor Country')
              
-        # Write
-        self._write_dataframe_to_sheet(ws, vendor_analysis[cols])
-        
-        # Specific formatting
-        for row in ws.iter_rows(min_row=2):
-            # Total Spend (Col C)
-            row[2].number_format = '$#,##0'
-            # Avg Tx (Col E)
-            row[4].number_format = '$#,##0.00'
-            # Pct (Col F)
-            row[5].number_format = '0.0%'
-            
-            # Top 10 green
-            if row[0].value and row[0].value <= 10:
-                for cell in row:
-                    cell.fill = PatternFill(start_color='E2EFDA', fill_type='solid')
+        return vendor_analysis[cols]
 
-        self._apply_standard_formatting(ws)
+    def _create_vendor_analysis(self, wb, vendor_analysis):
+        """Sheet 2: Spend by Vendor"""
+        ws = wb.add_worksheet("Spend by Vendor")
+        
+        # Write (top 10 vendors highlighted green)
+        self._write_dataframe_to_sheet(
+            wb, ws, vendor_analysis,
+            number_formats={'Total Spend': '$#,##0', 'Average Transaction': '$#,##0.00',
+                            '% of Total Spend': '0.0%'},
+            highlight_rows=10,
+        )
 
-    def _create_category_analysis(self, wb, df):
-        """Sheet 3: Spend by Category"""
-        ws = wb.create_sheet("Spend by Category")
-        
+    def _build_category_table(self, df, total_spend):
+        """Table for Sheet 3: categories ranked by spend (None without a category column)"""
         if 'category' not in df.columns:
-            ws['A1'] = "No 'category' column available in data."
-            return
+            return None
 
-        category_analysis = df.groupby('category').agg({
+        # Unsorted: the result is ranked by spend below
+        category_analysis = df.groupby('category', sort=False, observed=True).agg({
             'amount': ['sum', 'count'],
             'vendor': 'nunique'
         }).reset_index()
         
         category_analysis.columns = ['Category', 'Total Spend', 'Transaction Count', 'Number of Vendors']
-        category_analysis['% of Total Spend'] = category_analysis['Total Spend'] / df['amount'].sum()
+        category_analysis['% of Total Spend'] = category_analysis['Total Spend'] / total_spend
         
         category_analysis = category_analysis.sort_values('Total Spend', ascending=False).reset_index(drop=True)
         category_analysis.insert(0, 'Rank', category_analysis.index + 1)
         
         col_order = ['Rank', 'Category', 'Total Spend', '% of Total Spend', 'Transaction Count', 'Number of Vendors']
-        self._write_dataframe_to_sheet(ws, category_analysis[col_order])
+        return category_analysis[col_order]
+
+    def _create_category_analysis(self, wb, category_analysis):
+        """Sheet 3: Spend by Category"""
+        ws = wb.add_worksheet("Spend by Category")
         
-        # Formatting
-        for row in ws.iter_rows(min_row=2):
-            row[2].number_format = '$#,##0'
-            row[3].number_format = '0.0%'
+        if category_analysis is None:
+            ws.write('A1', "No 'category' column available in data.")
+            return
 
-        self._apply_standard_formatting(ws)
+        self._write_dataframe_to_sheet(
+            wb, ws, category_analysis,
+            number_formats={'Total Spend': '$#,##0', '% of Total Spend': '0.0%'},
+        )
 
-    def _create_monthly_trends(self, wb, df):
-        """Sheet 4: Monthly Trends"""
-        ws = wb.create_sheet("Monthly Trends")
-        
-        df_copy = df.copy()
-        df_copy['month'] = pd.to_datetime(df_copy['date']).dt.to_period('M')
+    def _build_monthly_table(self, df):
+        """Table for Sheet 4: spend per calendar month"""
+        month = df['date'].dt.to_period('M').rename('month')
         
-        monthly = df_copy.groupby('month').agg({
+        # Sorted on purpose: the sheet lists months chronologically
+        monthly = df.groupby(month, observed=True).agg({
             'amount': ['sum', 'count', 'mean'],
             'vendor': 'nunique'
         }).reset_index()
         
         monthly.columns = ['Month', 'Total Spend', 'Transaction Count', 'Average Transaction', 'Number of Vendors']
         monthly['Month'] = monthly['Month'].astype(str) # Convert period to string for Excel
-        
-        self._write_dataframe_to_sheet(ws, monthly)
-        
-        for row in ws.iter_rows(min_row=2):
-            row[1].number_format = '$#,##0'
-            row[3].number_format = '$#,##0.00'
+        return monthly
 
-        self._apply_standard_formatting(ws)
+    def _create_monthly_trends(self, wb, monthly):
+        """Sheet 4: Monthly Trends"""
+        ws = wb.add_worksheet("Monthly Trends")
+        
+        self._write_dataframe_to_sheet(
+            wb, ws, monthly,
+            number_formats={'Total Spend': '$#,##0', 'Average Transaction': '$#,##0.00'},
+        )
 
-    def _create_insights(self, wb, df):
+    def _create_insights(self, wb, df, vendor_agg, total_spend):
         """Sheet 5: Top Insights"""
-        ws = wb.create_sheet("Top Insights")
+        ws = wb.add_worksheet("Top Insights")
+        ws.set_column('A:A', 80)
         
-        ws['A1'] = 'TOP INSIGHTS'
-        ws['A1'].font = Font(size=14, bold=True, color='4472C4')
+        ws.write('A1', 'TOP INSIGHTS', wb.add_format(_INSIGHTS_TITLE_STYLE))
         
         insights = []
         
         # 1. Supplier Consolidation
-        vendor_stats = df.groupby('vendor')['amount'].sum()
-        tail_vendors = vendor_stats[vendor_stats < 5000]
-        if not tail_vendors.empty:
-            tail_spend = tail_vendors.sum()
+        vendor_spend = vendor_agg['sum'].to_numpy()
+        tail_mask = vendor_spend < 5000
+        tail_count = int(tail_mask.sum())
+        if tail_count:
+            tail_spend = vendor_spend[tail_mask].sum()
             insights.append({
                 'title': 'SUPPLIER CONSOLIDATION',
-                'finding': f"{len(tail_vendors)} vendors have spend < $5,000",
+                'finding': f"{tail_count} vendors have spend < $5,000",
                 'data': f"Total Tail Spend: ${tail_spend:,.0f}",
                 'savings': f"Potential Savings: ${tail_spend*0.15:,.0f} - ${tail_spend*0.20:,.0f} (15-20%)",
                 'action': "Consolidate to preferred vendors"
             })
             
         # 2. Vendor Concentration
-        top_10_spend = vendor_stats.nlargest(10).sum()
-        total_spend = df['amount'].sum()
+        # np.partition is O(vendors): the top 10 only need to land on the right, not be sorted
+        split = max(len(vendor_spend) - 10, 0)
+        top_10_spend = np.partition(vendor_spend, split)[split:].sum() if len(vendor_spend) else 0.0
         conc_pct = (top_10_spend / total_spend) * 100
         
         insights.append({
@@ -301,125 +406,156 @@ class DataLoader:
             'action': "Diversify supply base if concentration is high"
         })
         
+        title_format = wb.add_format(_INSIGHT_STYLE)
         current_row = 3
         for idx, insight in enumerate(insights, 1):
-            ws[f'A{current_row}'] = f"INSIGHT #{idx}: {insight['title']}"
-            ws[f'A{current_row}'].font = Font(bold=True, size=11)
-            current_row += 1
-            
-            ws[f'A{current_row}'] = f"Finding: {insight['finding']}"
-            current_row += 1
-            ws[f'A{current_row}'] = insight['data']
+            ws.write(f'A{current_row}', f"INSIGHT #{idx}: {insight['title']}", title_format)
             current_row += 1
-            ws[f'A{current_row}'] = insight['savings']
-            current_row += 1
-            ws[f'A{current_row}'] = f"Action: {insight['action']}"
-            current_row += 2 # Spacer
             
-        ws.column_dimensions['A'].width = 80
+            ws.write_column(f'A{current_row}', [
+                f"Finding: {insight['finding']}",
+                insight['data'],
+                insight['savings'],
+                f"Action: {insight['action']}",
+            ])
+            current_row += 5 # Four lines plus spacer
 
     def _create_detailed_data(self, wb, df):
         """Sheet 6: Detailed Data"""
-        ws = wb.create_sheet("Detailed Data")
+        ws = wb.add_worksheet("Detailed Data")
         
-        # Limit rows for performance if needed, but specification says export entire DF
-        # Using dataframe_to_rows is efficient
-        if len(df) > 100000:
-             # Just a warning or limit could be applied here
-             pass
+        # Per-cell borders on the full export bloat the file for little value; opt in via config
+        self._write_dataframe_to_sheet(wb, ws, df, bordered=self.config.get('detailed_borders', False))
 
-        self._write_dataframe_to_sheet(ws, df)
-        self._apply_standard_formatting(ws)
+    def _build_completeness(self, df):
+        """Completeness % per column for Sheet 7"""
+        # count() reduces per column without materializing a boolean frame like notna()
+        return df.count().mul(100.0 / len(df))
 
-    def _create_data_quality_report(self, wb, df):
+    def _create_data_quality_report(self, wb, completeness):
         """Sheet 7: Data Quality Report"""
-        ws = wb.create_sheet("Data Quality Report")
+        ws = wb.add_worksheet("Data Quality Report")
+        ws.set_column('A:A', 30)
+        ws.set_column('B:B', 20)
+        ws.set_column('C:C', 15)
         
-        ws['A1'] = 'DATA QUALITY ASSESSMENT'
-        ws['A1'].font = Font(size=14, bold=True)
+        ws.write('A1', 'DATA QUALITY ASSESSMENT', wb.add_format(_SHEET_TITLE_STYLE))
         
-        completeness = (df.notna().sum() / len(df)) * 100
         overall_score = completeness.mean()
         
-        ws['A2'] = f"Overall Quality Score: {overall_score:.1f}%"
-        ws['A2'].font = Font(bold=True)
+        ws.write('A2', f"Overall Quality Score: {overall_score:.1f}%", wb.add_format(_BOLD_STYLE))
         
         # Table Header
-        ws['A4'] = 'Field Name'
-        ws['B4'] = 'Completeness %'
-        ws['C4'] = 'Status'
+        ws.write_row('A4', ['Field Name', 'Completeness %', 'Status'], self._header_format(wb))
         
-        for cell in ws['4:4']:
-            if cell.value:
-                self._apply_header_style(cell)
+        pct_format = wb.add_format({'num_format': '0.0%'})
+        ok_format = wb.add_format(_GREEN_FILL)
+        warning_format = wb.add_format(_YELLOW_FILL)
+        critical_format = wb.add_format(_RED_FILL)
         
         row = 5
-        for col in df.columns:
-            comp_val = completeness[col]
-            ws[f'A{row}'] = col
-            ws[f'B{row}'] = comp_val / 100 # Store as decimal for % formatting
-            ws[f'B{row}'].number_format = '0.0%'
+        for col, comp_val in completeness.items():
+            ws.write(f'A{row}', col)
+            ws.write(f'B{row}', comp_val / 100, pct_format) # Store as decimal for % formatting
             
-            status_cell = ws[f'C{row}']
             if comp_val >= 90:
-                status_cell.value = 'OK'
-                status_cell.fill = PatternFill(start_color='C6EFCE', fill_type='solid') # Green
+                ws.write(f'C{row}', 'OK', ok_format)
             elif comp_val >= 70:
-                status_cell.value = 'WARNING'
-                status_cell.fill = PatternFill(start_color='FFE699', fill_type='solid') # Yellow
+                ws.write(f'C{row}', 'WARNING', warning_format)
             else:
-                status_cell.value = 'CRITICAL'
-                status_cell.fill = PatternFill(start_color='FFC7CE', fill_type='solid') # Red
+                ws.write(f'C{row}', 'CRITICAL', critical_format)
                 
             row += 1
-            
-        ws.column_dimensions['A'].width = 30
-        ws.column_dimensions['B'].width = 20
-        ws.column_dimensions['C'].width = 15
 
-    def _write_dataframe_to_sheet(self, ws, df):
+    def _write_dataframe_to_sheet(self, wb, ws, df, number_formats=None, highlight_rows=0, bordered=True):
         """Helper to write DF with headers"""
-        rows = dataframe_to_rows(df, index=False, header=True)
-        for r_idx, row in enumerate(rows, 1):
-            for c_idx, value in enumerate(row, 1):
-                cell = ws.cell(row=r_idx, column=c_idx, value=value)
-                if r_idx == 1:
-                    self._apply_header_style(cell)
+        number_formats = number_formats or {}
+        border = _BORDER if bordered else {}
+        
+        # Widths must be known before rows are flushed, so measure the frame instead of the cells
+        self._set_column_widths(ws, [max(len(str(col)), self._text_length(df[col])) for col in df.columns])
+        
+        ws.write_row(0, 0, [str(col) for col in df.columns], self._header_format(wb, border))
+        
+        # One format per column (and per highlighted column), registered once
+        date_cols = df.select_dtypes('datetime').columns
+        number_formats = {**{col: 'yyyy-mm-dd h:mm:ss' for col in date_cols}, **number_formats}
+        def column_formats(extra):
+            styles = [{**border, **extra, **({'num_format': number_formats[col]} if col in number_formats else {})}
+                      for col in df.columns]
+            # Unstyled columns get no format at all, so their cells are written without a style index
+            return [wb.add_format(style) if style else None for style in styles]
+        
+        plain_formats = column_formats({})
+        highlight_formats = column_formats(_HIGHLIGHT_FILL) if highlight_rows else None
+        
+        # Dates go out as Excel serials computed in one vectorized pass; the column's
+        # num_format still displays them as dates, and NaT becomes NaN (a blank cell)
+        if len(date_cols):
+            epoch = pd.Timestamp(EXCEL_EPOCH)
+            df = df.assign(**{col: (df[col] - epoch) / pd.Timedelta(days=1) for col in date_cols})
+        
+        # Likewise one writer per column: typed columns skip write()'s per-cell type dispatch
+        has_missing = df.columns[df.count() < len(df)]
+        writers = [ws.write if col in has_missing else self._column_writer(ws, df[col].dtype)
+                   for col in df.columns]
+        
+        # (column, format, writer) triples are paired up once, not re-zipped for every row
+        plain_cells = list(zip(range(len(writers)), plain_formats, writers))
+        highlight_cells = list(zip(range(len(writers)), highlight_formats, writers)) if highlight_rows else None
+        
+        for r_idx, values in enumerate(self._iter_rows(df, has_missing), 1):
+            cells = highlight_cells if r_idx <= highlight_rows else plain_cells
+            for (c_idx, fmt, write), value in zip(cells, values):
+                write(r_idx, c_idx, value, fmt)
                     
         # Freeze panes
-        ws.freeze_panes = 'A2'
+        ws.freeze_panes(1, 0)
         # Auto Filter
-        ws.auto_filter.ref = ws.dimensions
+        ws.autofilter(0, 0, len(df), len(df.columns) - 1)
 
-    def _apply_header_style(self, cell):
+    def _column_writer(self, ws, dtype):
+        """Typed xlsxwriter method for a column with no blanks, or write() for mixed/object data"""
+        if isinstance(dtype, pd.CategoricalDtype):
+            dtype = dtype.categories.dtype
+        if pd.api.types.is_bool_dtype(dtype):
+            return ws.write_boolean
+        if pd.api.types.is_numeric_dtype(dtype):
+            return ws.write_number
+        if pd.api.types.is_datetime64_dtype(dtype):
+            return ws.write_datetime
+        if dtype != object and pd.api.types.is_string_dtype(dtype):
+            # Also keeps text such as '=...' from becoming a formula
+            return ws.write_string
+        return ws.write
+
+    def _iter_rows(self, df, has_missing):
+        """Row tuples with missing values blanked, since xlsxwriter rejects NaN/NaT"""
+        if len(has_missing):
+            df = df.copy(deep=False)
+            for col in has_missing:
+                df[col] = df[col].astype(object).where(df[col].notna(), None)
+        return df.itertuples(index=False, name=None)
+
+    def _header_format(self, wb, extra=None):
         """Blue header, white text"""
-        cell.font = Font(bold=True, color='FFFFFF')
-        cell.fill = PatternFill(start_color='4472C4', fill_type='solid')
-        cell.alignment = Alignment(horizontal='center', vertical='center')
-
-    def _apply_standard_formatting(self, ws):
-        """Apply borders and auto-width"""
-        thin_border = Border(
-            left=Side(style='thin'), right=Side(style='thin'),
-            top=Side(style='thin'), bottom=Side(style='thin')
-        )
-        
-        for row in ws.iter_rows():
-            for cell in row:
-                cell.border = thin_border
-                
-        # Simple auto-width
-        for column in ws.columns:
-            max_length = 0
-            column_letter = get_column_letter(column[0].column)
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            ws.column_dimensions[column_letter].width = adjusted_width
+        return wb.add_format({**_HEADER_STYLE, **(extra or {})})
+
+    def _text_length(self, series):
+        """Longest text in a column, measured with vectorized string ops (0 when empty)"""
+        if pd.api.types.is_datetime64_any_dtype(series):
+            # Rendered as 'yyyy-mm-dd h:mm:ss', which str() shortens at midnight
+            return 19
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # Each distinct value once instead of once per row
+            series = series.cat.categories.to_series()
+        length = series.astype(str).str.len().max()
+        return 0 if pd.isna(length) else int(length)
+
+    def _set_column_widths(self, ws, lengths):
+        """Simple auto-width: longest value per column plus padding, capped at 50"""
+        for c_idx, max_length in enumerate(lengths):
+            ws.set_column(c_idx, c_idx, min(max_length + 2, 50))
 
 # Usage Example (if run directly)
 if __name__ == "__main__":